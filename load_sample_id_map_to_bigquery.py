@@ -14,6 +14,7 @@ already exist.
 
 from __future__ import annotations
 
+import functools
 import sys
 from pathlib import Path
 from typing import Optional
@@ -30,6 +31,13 @@ TABLE_ID = "src_sample_id_map"
 LOCAL_CSV = Path(__file__).resolve().parent / "sample_id_map.csv"
 
 
+@functools.lru_cache(maxsize=1)
+def get_bigquery_client() -> bigquery.Client:
+    """Return the BigQuery client shared by the load and verify steps."""
+
+    return bigquery.Client(project=PROJECT_ID)
+
+
 def load_to_bigquery(csv_path: Path) -> Optional[bigquery.Table]:
     """Load the local CSV into BigQuery, replacing existing data.
 
@@ -50,7 +58,7 @@ def load_to_bigquery(csv_path: Path) -> Optional[bigquery.Table]:
     print(f"  To:   {table_fqn}")
     print()
 
-    client = bigquery.Client(project=PROJECT_ID)
+    client = get_bigquery_client()
 
     # Explicit schema to avoid inference quirks with quoted/unquoted values
     schema = [
@@ -102,7 +110,7 @@ def verify_table() -> None:
     """Run simple queries to verify the table was loaded correctly."""
 
     table_fqn = f"{PROJECT_ID}.{DATASET_ID}.{TABLE_ID}"
-    client = bigquery.Client(project=PROJECT_ID)
+    client = get_bigquery_client()
 
     print("\nVerifying table with test queries...")
     try:
@@ -120,7 +128,8 @@ def verify_table() -> None:
             print(f"  Distinct sample_ids: {row.distinct_sample_ids:,}")
 
         print("\nSample rows:")
-        sample = client.query(f"SELECT * FROM `{table_fqn}` LIMIT 3").result()
+        # Read rows directly rather than running a SELECT * query job
+        sample = client.list_rows(table_fqn, max_results=3)
         for row in sample:
             print(f"  {dict(row)}")
 
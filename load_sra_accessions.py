@@ -3,148 +3,428 @@
 Load SRA Accessions metadata from NCBI FTP to BigQuery.
 
 Downloads the SRA_Accessions.tab file (28GB) and loads it into BigQuery.
-Uses local temp file → gzip → GCS → BigQuery pipeline for reliability.
+Streams NCBI → GCS in a single pass (no local temp file) over parallel HTTP
+Range requests, splitting the file into uncompressed parts on line
+boundaries, then loads all parts from GCS → BigQuery with one wildcard load
+job. Parts are left uncompressed: BigQuery can split plain TSV across
+workers, and skipping gzip removes the CPU-bound stage from the pipeline.
 """
 
 import sys
-import gzip
-import shutil
-import tempfile
-import subprocess
-from pathlib import Path
+import functools
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 import httpx
 from tqdm import tqdm
 from google.cloud import bigquery
-import duckdb
+from google.cloud import storage
 
 # Configuration
 PROJECT_ID = "curatedmetagenomicdata"
 DATASET_ID = "curatedmetagenomicsdata"
 TABLE_ID = "src_sra_accessions"
 GCS_BUCKET = "cmgd-data"
-GCS_PATH_PREFIX = "sra_metadata/chunks/SRA_Accessions"  # Will add _part001.tab.gz, etc.
+GCS_PATH_PREFIX = "sra_metadata/chunks/SRA_Accessions"  # Will add _part0000.tab, etc.
 SOURCE_URL = "https://ftp.ncbi.nlm.nih.gov/sra/reports/Metadata/SRA_Accessions.tab"
-CHUNK_SIZE = 10 * 1024 * 1024  # 10MB chunks for streaming
-LINES_PER_CHUNK = 500000  # Split file into chunks of 500k lines each
+HTTP_CHUNK_SIZE = 128 * 1024  # 128KiB reads from the NCBI response
+HEADER_PROBE_SIZE = 64 * 1024  # Bytes requested to read the header row
+DOWNLOAD_WORKERS = 8  # Parallel Range requests to NCBI, one connection each
+RANGE_RETRIES = 5  # Resumes per range after a dropped or stalled connection
+PART_SIZE = 128 * 1024 * 1024  # Cut a part at the first line end past 128MiB
+UPLOAD_WORKERS = 8  # Concurrent part uploads
+# Parts queued for or in upload. Peak memory is about 4GB at worst:
+#   DOWNLOAD_WORKERS parts being filled or waiting for a slot  ~1.1GB
+#   MAX_PARTS_IN_FLIGHT parts plus each 100MiB upload chunk    ~1.8GB
+#   one transient bytes() copy per part as its slot frees up   <1.0GB
+MAX_PARTS_IN_FLIGHT = 8
+
+# Explicit schema in SRA_Accessions.tab column order; everything is loaded as
+# STRING so a stray row can't fail the load or flip a column's inferred type
+SCHEMA = [
+    bigquery.SchemaField("Accession", "STRING"),
+    bigquery.SchemaField("Submission", "STRING"),
+    bigquery.SchemaField("Status", "STRING"),
+    bigquery.SchemaField("Updated", "STRING"),
+    bigquery.SchemaField("Published", "STRING"),
+    bigquery.SchemaField("Received", "STRING"),
+    bigquery.SchemaField("Type", "STRING"),
+    bigquery.SchemaField("Center", "STRING"),
+    bigquery.SchemaField("Visibility", "STRING"),
+    bigquery.SchemaField("Alias", "STRING"),
+    bigquery.SchemaField("Experiment", "STRING"),
+    bigquery.SchemaField("Sample", "STRING"),
+    bigquery.SchemaField("Study", "STRING"),
+    bigquery.SchemaField("Loaded", "STRING"),
+    bigquery.SchemaField("Spots", "STRING"),
+    bigquery.SchemaField("Bases", "STRING"),
+    bigquery.SchemaField("Md5sum", "STRING"),
+    bigquery.SchemaField("BioSample", "STRING"),
+    bigquery.SchemaField("BioProject", "STRING"),
+    bigquery.SchemaField("ReplacedBy", "STRING"),
+]
+
+# Columns shown by verify_table() (the full row has 20 fields)
+SAMPLE_COLUMNS = ("Accession", "Type", "Status", "BioProject")
+
+
+@functools.lru_cache(maxsize=1)
+def get_bigquery_client() -> bigquery.Client:
+    """Shared BigQuery client, so credentials are discovered once per run."""
+
+    return bigquery.Client(project=PROJECT_ID)
+
+
+@functools.lru_cache(maxsize=1)
+def get_storage_client() -> storage.Client:
+    """Shared GCS client, so credentials are discovered once per run."""
+
+    return storage.Client(project=PROJECT_ID)
+
+
+@functools.lru_cache(maxsize=1)
+def get_http_client() -> httpx.Client:
+    """Shared HTTP client for NCBI.
+
+    One pooled client keeps connections (and their TLS sessions) alive
+    across requests instead of handshaking per download. It stays on
+    HTTP/1.1 so each range worker gets its own TCP connection; HTTP/2 would
+    multiplex them all over one.
+    """
+
+    return httpx.Client(
+        follow_redirects=True,
+        # No overall deadline for the multi-GB range streams, but a
+        # connection that stalls fails (and the range resumes) rather than
+        # blocking its worker forever
+        timeout=httpx.Timeout(None, connect=30.0, read=120.0),
+        limits=httpx.Limits(
+            max_keepalive_connections=DOWNLOAD_WORKERS,
+            max_connections=DOWNLOAD_WORKERS * 2,
+        ),
+    )
+
+
+def fetch_header():
+    """Fetch and validate the header row, and find out if ranges are served.
+
+    Asks for the first HEADER_PROBE_SIZE bytes with a Range request. A 206
+    reply carries the full file size in Content-Range; a 200 means the
+    server ignored the range, and only enough of the body to see the header
+    is read before the response is closed.
+
+    NCBI regenerates the file in place, so the 206 reply's strong ETag (or
+    Last-Modified) is kept to pin every later range to this same version.
+
+    Returns:
+        (header, total_size, validator): header row including its newline,
+        the file size in bytes, or None if the server does not support
+        ranges, and the If-Range validator, or None if the reply had none
+    """
+
+    headers = {"Accept-Encoding": "identity", "Range": f"bytes=0-{HEADER_PROBE_SIZE - 1}"}
+
+    with get_http_client().stream("GET", SOURCE_URL, headers=headers) as response:
+        response.raise_for_status()
+
+        head = b""
+        for chunk in response.iter_raw(HTTP_CHUNK_SIZE):
+            head += chunk
+            if b"\n" in head:
+                break
+
+        total_size = None
+        validator = None
+        if response.status_code == 206:
+            total_size = int(response.headers["content-range"].rsplit("/", 1)[1])
+            # If-Range only accepts strong validators; a weak ETag can't pin ranges
+            etag = response.headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                validator = etag
+            else:
+                validator = response.headers.get("last-modified")
+
+    header_end = head.find(b"\n") + 1
+    if not header_end:
+        raise ValueError("No header row found at the start of SRA_Accessions.tab")
+    header = head[:header_end]
+
+    # Fail before the 28GB transfer, not at load time, if NCBI changed columns
+    columns = header.decode().rstrip("\r\n").split("\t")
+    if columns != [field.name for field in SCHEMA]:
+        raise ValueError(f"Unexpected SRA_Accessions.tab header: {columns}")
+
+    return header, total_size, validator
+
+
+def stream_segment(start, end, header, total_size, validator, submit_part,
+                   progress, progress_lock, stop):
+    """Stream the rows that start within bytes [start, end) into parts.
+
+    A row belongs to the segment its first byte falls in. The fetch begins
+    one byte early and drops everything through the first newline, so a
+    segment never starts mid-row, and it reads past `end` until the row
+    spanning the boundary is complete. Adjacent segments therefore meet on
+    the same newline without overlap or gaps. A dropped or stalled
+    connection resumes the range from the last byte received, up to
+    RANGE_RETRIES times.
 
+    Args:
+        start: First byte offset owned by this segment
+        end: Byte offset where the next segment begins
+        header: Header row, prefixed to every part
+        total_size: File size, or None to read the whole file without a
+            Range request (the header row is then dropped as the leading
+            partial row)
+        validator: ETag or Last-Modified from fetch_header, sent as If-Range
+        submit_part: Callback taking a finished part (bytearray)
+        progress: Shared tqdm bar
+        progress_lock: Lock guarding progress updates across range workers
+        stop: Event set when another stage has failed
+    """
+
+    # iter_raw() keeps httpx's per-chunk decoder overhead off the hot loop.
+    # Asking for identity encoding guarantees the raw bytes are the file.
+    headers = {"Accept-Encoding": "identity"}
+    if total_size is None:
+        position = 0
+    else:
+        position = start - 1
+        # If the file was replaced since the probe the server answers 200,
+        # which the status check below rejects
+        headers["If-Range"] = validator
+
+    part = bytearray(header)
+    skipping = True
+    complete = False
+
+    for attempt in range(RANGE_RETRIES + 1):
+        if total_size is not None:
+            headers["Range"] = f"bytes={position}-{total_size - 1}"
+        try:
+            with get_http_client().stream("GET", SOURCE_URL, headers=headers) as response:
+                response.raise_for_status()
+
+                # A 200 here would restart the file from byte 0 (or from a newer
+                # version of it) and duplicate or drop rows
+                if total_size is not None:
+                    content_range = response.headers.get("content-range", "")
+                    if (
+                        response.status_code != 206
+                        or not content_range.startswith(f"bytes {position}-")
+                        or not content_range.endswith(f"/{total_size}")
+                    ):
+                        raise ValueError(
+                            f"Range request for byte {position} got HTTP {response.status_code} "
+                            f"(Content-Range: {content_range or 'missing'})"
+                        )
+
+                for chunk in response.iter_raw(HTTP_CHUNK_SIZE):
+                    # Hot loop: one append and a length check per chunk;
+                    # lines are only located when a part is cut, and tqdm throttles
+                    # redraws instead of printing per chunk
+                    if stop.is_set():
+                        return
+                    chunk_start = position
+                    position += len(chunk)
+
+                    if skipping:
+                        newline = chunk.find(b"\n")
+                        if newline < 0:
+                            continue
+                        chunk = chunk[newline + 1:]
+                        chunk_start += newline + 1
+                        skipping = False
+                        # The row spanning `start` runs past `end`: none start here
+                        if chunk_start >= end:
+                            complete = True
+                            break
+
+                    boundary = -1
+                    if position >= end:
+                        boundary = chunk.find(b"\n", max(end - 1 - chunk_start, 0))
+                        if boundary >= 0:
+                            chunk = chunk[:boundary + 1]
+
+                    # Count only the bytes this segment owns so the bar totals the file
+                    with progress_lock:
+                        progress.update(len(chunk))
+                    part += chunk
+
+                    if len(part) >= PART_SIZE:
+                        # Cut after the last complete line; the partial line carries
+                        # over. Every part starts with the header so
+                        # skip_leading_rows=1 holds per file.
+                        cut = part.rfind(b"\n") + 1
+                        if cut > len(header):
+                            next_part = bytearray(header)
+                            next_part += part[cut:]
+                            del part[cut:]
+                            submit_part(part)
+                            part = next_part
+
+                    if boundary >= 0:
+                        complete = True
+                        break
+            break
+        except httpx.TransportError as e:
+            # Ranges make resuming cheap: the state above already reflects
+            # every byte received, so re-request from `position` onwards
+            if total_size is None or attempt == RANGE_RETRIES or stop.is_set():
+                raise
+            tqdm.write(f"  Range at byte {position} failed ({e!r}); retrying")
+            time.sleep(2 ** attempt)
+
+    # A body cut short (dropped connection, empty 206) would otherwise lose
+    # the rest of the segment without an error
+    if total_size is not None and not complete and position < total_size:
+        raise ValueError(f"Range for bytes {start}-{end - 1} ended early at byte {position}")
+
+    if len(part) > len(header):
+        if not part.endswith(b"\n"):
+            part += b"\n"
+        submit_part(part)
+
+
+def upload_part(blob, data):
+    """Upload one part (runs on an upload worker).
 
-def ncbi_to_parquet(input_tab_path, output_parquet_path):
-    """Convert NCBI SRA Accessions tab file to Parquet using DuckDB for efficiency.
-    
     Args:
-        input_tab_path: Path to input .tab file
-        output_parquet_path: Path to output .parquet file
+        blob: Destination blob for the part
+        data: Part contents (bytes)
     """
 
-    print("\nConverting to Parquet using DuckDB:")
-    print(f"  From: {input_tab_path}")
-    print(f"  To:   {output_parquet_path}")
+    blob.upload_from_string(data, content_type="text/tab-separated-values")
 
-    try:
-        con = duckdb.connect(database=':memory:')
-        con.execute(f"""
-            COPY (
-                SELECT *
-                FROM read_csv_auto('{input_tab_path}', delim='\t', header=True, nullstr='-')
-            ) TO '{output_parquet_path}' (FORMAT 'parquet', COMPRESSION 'snappy', file_size_bytes '128MB', FILENAME_PATTERN 'sra_accessions_{{i}}');
-        """)
-        con.close()
 
-        print("✓ Conversion to Parquet complete")
+def stream_split_to_gcs():
+    """Stream the NCBI file into GCS as parts split on line boundaries.
 
-    except Exception as e:
-        print(f"✗ Conversion to Parquet failed: {e}")
-        sys.exit(1)
+    Nothing is staged on local disk. The work runs as a two-stage pipeline
+    so the stages overlap instead of running back to back:
 
+    1. Download (DOWNLOAD_WORKERS threads): each fetches one byte range of
+       the file over its own connection and cuts it into parts of roughly
+       PART_SIZE bytes, each prefixed with the header row
+    2. Upload (UPLOAD_WORKERS threads): write each part to GCS
+
+    At most MAX_PARTS_IN_FLIGHT parts wait on or are in stage 2; downloads
+    wait for a slot once that many are buffered.
 
-def upload_chunks_parallel(chunks_dir):
-    """Upload all compressed chunk files to GCS in parallel using gcloud CLI.
-    
-    Uses wildcard pattern to upload all chunks with a single gcloud command,
-    leveraging parallel composite uploads for maximum throughput.
-    
-    Args:
-        chunks_dir: Directory containing the compressed chunk files (*.parquet)
-    
     Returns:
-        Wildcard GCS URI pattern for the uploaded files
+        Wildcard GCS URI pattern for the uploaded parts
     """
-    
-    chunks_dir = Path(chunks_dir)
-    wildcard_pattern = str(chunks_dir / "*.parquet")
-    gcs_destination = f"gs://{GCS_BUCKET}/{GCS_PATH_PREFIX.rsplit('/', 1)[0]}/"
-    
-    print("\nUploading chunks to GCS (parallel):")
-    print(f"  From: {wildcard_pattern}")
-    print(f"  To:   {gcs_destination}")
-    
+
+    wildcard_uri = f"gs://{GCS_BUCKET}/{GCS_PATH_PREFIX}_part*.tab"
+
+    print("\nStreaming NCBI to GCS (split into parts):")
+    print(f"  From: {SOURCE_URL}")
+    print(f"  To:   {wildcard_uri}")
+
+    bucket = get_storage_client().bucket(GCS_BUCKET)
+
+    # Parts from an earlier run would be picked up by the wildcard load
+    stale_parts = list(bucket.list_blobs(prefix=f"{GCS_PATH_PREFIX}_part"))
+    if stale_parts:
+        print(f"  Removing {len(stale_parts)} part(s) from a previous run")
+        bucket.delete_blobs(stale_parts)
+
+    part_num = 0
+    part_lock = threading.Lock()
+    slots = threading.BoundedSemaphore(MAX_PARTS_IN_FLIGHT)
+    progress_lock = threading.Lock()
+    stop = threading.Event()
+    uploads = []
+
+    download_pool = ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS, thread_name_prefix="download")
+    upload_pool = ThreadPoolExecutor(max_workers=UPLOAD_WORKERS, thread_name_prefix="upload")
+
+    def release_slot(_):
+        slots.release()
+
+    def submit_part(part):
+        nonlocal part_num
+        slots.acquire()
+        # Copy to bytes only once a slot is free, so a download worker
+        # blocked above holds a single copy of its part. upload_from_string
+        # then reads the bytes in place.
+        data = bytes(part)
+        with part_lock:
+            blob = bucket.blob(f"{GCS_PATH_PREFIX}_part{part_num:04d}.tab")
+            part_num += 1
+
+        upload = upload_pool.submit(upload_part, blob, data)
+        upload.add_done_callback(release_slot)
+        uploads.append(upload)
+
+        # Surface a failed upload now rather than after the whole download
+        for pending in uploads:
+            if pending.done() and pending.exception():
+                raise pending.exception()
+
     try:
-        # Use gcloud with wildcard for parallel uploads
-        cmd = [
-            "gcloud", "storage", "cp",
-            wildcard_pattern,
-            gcs_destination,
-            "--recursive"
-        ]
-        
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-        
-        # Show gcloud output
-        if result.stdout:
-            print(result.stdout)
-        
-        # Return wildcard URI pattern for BigQuery load
-        wildcard_uri = f"gs://{GCS_BUCKET}/{GCS_PATH_PREFIX}_part*.tab.gz"
-        print("\n✓ Parallel upload complete")
+        header, total_size, validator = fetch_header()
+
+        if total_size is None:
+            print("  Server ignored the Range request; downloading as one stream")
+            segments = [(len(header), sys.maxsize)]
+        elif validator is None:
+            # Without If-Range the ranges could mix versions of the file
+            print("  No ETag or Last-Modified to pin the file version; downloading as one stream")
+            total_size = None
+            segments = [(len(header), sys.maxsize)]
+        else:
+            print(f"  Size: {total_size / (1024**3):.2f} GB in {DOWNLOAD_WORKERS} ranges")
+            step = -(-(total_size - len(header)) // DOWNLOAD_WORKERS)
+            segments = [
+                (start, min(start + step, total_size))
+                for start in range(len(header), total_size, step)
+            ]
+
+        # tqdm takes None for an unknown total (no range support)
+        with tqdm(total=total_size, unit="B", unit_scale=True,
+                  unit_divisor=1024, desc="  Streaming") as progress:
+            progress.update(len(header))
+            downloads = [
+                download_pool.submit(
+                    stream_segment, start, end, header, total_size, validator,
+                    submit_part, progress, progress_lock, stop,
+                )
+                for start, end in segments
+            ]
+            # Raise as soon as any range fails rather than waiting on the
+            # others; every download is in `done` when none failed
+            done, _ = wait(downloads, return_when=FIRST_EXCEPTION)
+            for download in done:
+                download.result()
+
+        # Drain in stage order: every part has been queued for upload once
+        # the download pool is shut down
+        download_pool.shutdown(wait=True)
+        upload_pool.shutdown(wait=True)
+        for upload in uploads:
+            upload.result()
+
+        print(f"✓ Upload complete: {part_num} parts")
+        print(f"  Streamed {progress.n / (1024**3):.2f} GB from NCBI")
         print(f"  URI pattern: {wildcard_uri}")
-        
         return wildcard_uri
-        
-    except subprocess.CalledProcessError as e:
-        print(f"✗ gcloud upload failed: {e}")
-        if e.stderr:
-            print(f"Error output: {e.stderr}")
-        sys.exit(1)
-
-
-def upload_to_gcs(local_path, gcs_uri):
-    """Upload local file to GCS using gcloud CLI for faster parallel uploads."""
-
-    print("\nUploading to GCS (using parallel composite upload):")
-    print(f"  From: {local_path}")
-    print(f"  To:   {gcs_uri}")
 
-    try:
-        # Use gcloud storage cp with parallel composite uploads (much faster)
-        # This automatically splits the file into chunks and uploads them in parallel
-        subprocess.run(
-            ["gcloud", "storage", "cp", str(local_path), gcs_uri],
-            check=True,
-            capture_output=True,
-            text=True,
-        )
-
-        print(f"✓ Upload complete: {gcs_uri}")
-        return gcs_uri
-
-    except subprocess.CalledProcessError as e:
-        print(f"✗ Upload to GCS failed: {e}")
-        if e.stderr:
-            print(f"  Error output: {e.stderr}")
-        sys.exit(1)
-    except FileNotFoundError:
-        print("✗ gcloud CLI not found. Please install: https://cloud.google.com/sdk/docs/install")
-        sys.exit(1)
     except Exception as e:
-        print(f"✗ Upload to GCS failed: {e}")
+        print(f"✗ Streaming to GCS failed: {e}")
+        # Stop the other range workers before closing the upload pool so no
+        # finished part tries to queue on a closed pool
+        stop.set()
+        download_pool.shutdown(wait=True, cancel_futures=True)
+        upload_pool.shutdown(wait=False, cancel_futures=True)
         sys.exit(1)
 
 
 def load_to_bigquery(gcs_uri_wildcard: str):
-    """Load gzipped chunk files from GCS into BigQuery using a single wildcard URI.
+    """Load part files from GCS into BigQuery using a single wildcard URI.
 
     This issues one load job with WRITE_TRUNCATE and relies on BigQuery's
-    support for wildcard URIs to ingest all matching files.
+    support for wildcard URIs to ingest all matching files in parallel.
     """
 
     table_id = f"{PROJECT_ID}.{DATASET_ID}.{TABLE_ID}"
@@ -154,17 +434,20 @@ def load_to_bigquery(gcs_uri_wildcard: str):
     print(f"  To:              {table_id}")
     print("This will take several minutes...\n")
 
-    client = bigquery.Client(project=PROJECT_ID)
+    client = get_bigquery_client()
 
     job_config = bigquery.LoadJobConfig(
         source_format=bigquery.SourceFormat.CSV,
         field_delimiter='\t',
-        autodetect=True,
+        schema=SCHEMA,
+        autodetect=False,
         write_disposition='WRITE_TRUNCATE',
         skip_leading_rows=1,
-        allow_quoted_newlines=True,
+        # Plain TSV with no quoting: a stray '"' in a field stays literal, and
+        # BigQuery can split files without tracking quote state
+        quote_character='',
+        allow_quoted_newlines=False,
         allow_jagged_rows=False,
-        compression='GZIP',
         null_marker='-',
     )
 
@@ -200,7 +483,7 @@ def verify_table():
 
     print("\nVerifying table with test query...")
 
-    client = bigquery.Client(project=PROJECT_ID)
+    client = get_bigquery_client()
 
     query = f"""
     SELECT
@@ -218,118 +501,71 @@ def verify_table():
 
         print("\n✓ Verification successful!")
 
-        # Show sample of the data
+        # Show sample of the data. list_rows reads table data directly, so
+        # unlike SELECT * ... LIMIT it runs no query and bills no full scan
         print("\nSample rows:")
-        sample_query = f"SELECT * FROM `{table_id}` LIMIT 3"
-        sample_result = client.query(sample_query).result()
+        sample_fields = [field for field in SCHEMA if field.name in SAMPLE_COLUMNS]
+        sample_rows = client.list_rows(table_id, selected_fields=sample_fields, max_results=3)
 
-        for row in sample_result:
+        for row in sample_rows:
             print(f"  {dict(row)}")
 
     except Exception as e:
         print(f"✗ Verification query failed: {e}")
 
 
-def cleanup_gcs(gcs_uris, keep_file=False):
-    """Optionally clean up GCS files after load.
-    
-    Args:
-        gcs_uris: Single URI string or list of URIs to clean up
-    """
-
-    # Handle both single file and list of files
-    if isinstance(gcs_uris, str):
-        gcs_uris = [gcs_uris]
-
-    if keep_file:
-        print(f"\nKeeping {len(gcs_uris)} GCS file(s) for future reloads")
-        for uri in gcs_uris[:3]:
-            print(f"  {uri}")
-        if len(gcs_uris) > 3:
-            print(f"  ... and {len(gcs_uris) - 3} more")
-        print("  To delete manually: gcloud storage rm gs://BUCKET/path/to/files/*")
-    else:
-        print(f"\nCleaning up {len(gcs_uris)} GCS file(s)...")
-        try:
-            # Use gcloud to delete all chunk files efficiently
-            if len(gcs_uris) > 0:
-                # Extract the pattern for bulk delete
-                subprocess.run(
-                    ["gcloud", "storage", "rm"] + gcs_uris,
-                    check=True,
-                    capture_output=True,
-                    text=True,
-                )
-                print(f"✓ {len(gcs_uris)} GCS file(s) deleted")
-        except subprocess.CalledProcessError as e:
-            print(f"✗ Cleanup failed (non-critical): {e}")
-            if e.stderr:
-                print(f"  Error: {e.stderr}")
-        except Exception as e:
-            print(f"✗ Cleanup failed (non-critical): {e}")
+def cleanup_gcs():
+    """Delete the staged parts from GCS after load.
 
+    Uses the storage client rather than gcloud, so cleanup works wherever
+    the upload did.
+    """
 
-def cleanup_local_files(temp_dir):
-    """Clean up local temporary files."""
+    bucket = get_storage_client().bucket(GCS_BUCKET)
+    parts = list(bucket.list_blobs(prefix=f"{GCS_PATH_PREFIX}_part"))
 
-    print(f"\nCleaning up local temp files: {temp_dir}")
+    print(f"\nCleaning up {len(parts)} GCS part(s)...")
     try:
-        shutil.rmtree(temp_dir)
-        print("✓ Local temp files deleted")
+        bucket.delete_blobs(parts)
+        print(f"✓ {len(parts)} GCS part(s) deleted")
     except Exception as e:
-        print(f"✗ Local cleanup failed (non-critical): {e}")
+        print(f"✗ Cleanup failed (non-critical): {e}")
 
 
 def main():
     """Main function to orchestrate the load."""
 
     print("="*80)
-    print("Loading SRA Accessions to BigQuery (Chunked)")
+    print("Loading SRA Accessions to BigQuery")
     print("="*80)
     print(f"Source: {SOURCE_URL}")
     print(f"Target: {PROJECT_ID}.{DATASET_ID}.{TABLE_ID}")
-    print(f"Staging: gs://{GCS_BUCKET}/{GCS_PATH_PREFIX}_*.tab.gz")
-    print(f"Chunk size: {LINES_PER_CHUNK:,} lines per file")
+    print(f"Staging: gs://{GCS_BUCKET}/{GCS_PATH_PREFIX}_part*.tab")
+    print(f"Part size: {PART_SIZE // (1024**2)} MB per file")
     print("="*80)
     print()
 
-    # Create temp directory for downloads
-    temp_dir = tempfile.mkdtemp(prefix="sra_accessions_")
-    print(f"Using temp directory: {temp_dir}\n")
-
     try:
 
-        # Step 0: Convert NCBI SRA Accessions tab file to Parquet
-        print("STEP 0: Convert NCBI SRA Accessions to Parquet")
-        print("-" * 80)
-        ncbi_to_parquet(SOURCE_URL, Path(temp_dir))
-        
-        exit(2)
-
-        # Step 2: Upload chunks to GCS (parallel)
-        print("\nSTEP 2: Upload Chunks to GCS (Parallel)")
+        # Step 1: Stream NCBI → parts in GCS (no local temp files)
+        print("STEP 1: Stream NCBI to GCS (Split into Parts)")
         print("-" * 80)
-        wildcard_uri = upload_chunks_parallel(Path(temp_dir))
+        wildcard_uri = stream_split_to_gcs()
 
-        # Step 3: Load to BigQuery (single job with wildcard)
-        print("\nSTEP 3: Load to BigQuery")
+        # Step 2: Load to BigQuery (single job with wildcard)
+        print("\nSTEP 2: Load to BigQuery")
         print("-" * 80)
         load_to_bigquery(wildcard_uri)
 
-        # Step 4: Verify
-        print("\nSTEP 4: Verify Table")
+        # Step 3: Verify
+        print("\nSTEP 3: Verify Table")
         print("-" * 80)
         verify_table()
 
-        # Step 5: Cleanup GCS (keep by default since it's compressed)
-        print("\nSTEP 5: Cleanup GCS")
-        print("-" * 80)
-        cleanup_gcs(wildcard_uri, keep_file=True)
-
-        # Step 6: Cleanup local files (always delete)
-        print("\nSTEP 6: Cleanup Local Files")
+        # Step 4: Cleanup GCS (the uncompressed parts total 28GB, so don't keep them)
+        print("\nSTEP 4: Cleanup GCS")
         print("-" * 80)
-        cleanup_local_files(temp_dir)
+        cleanup_gcs()
 
         print("\n" + "="*80)
         print("Load Complete!")
@@ -339,8 +575,6 @@ def main():
 
     except Exception as e:
         print(f"\n✗ Pipeline failed: {e}")
-        print("\nCleaning up temp files...")
-        ## cleanup_local_files(temp_dir)
         sys.exit(1)
 
 
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Offline checks for the SRA_Accessions.tab range split in load_sra_accessions.py.
+
+Runs stream_split_to_gcs() against a fake NCBI server and a fake GCS bucket,
+then checks that every row lands in exactly one part. This covers the row
+ownership rule at the segment boundaries, segments that own no rows, a final
+row without a trailing newline, the single-stream fallback, and the failure
+paths (ignored or mismatched ranges, a replaced file, dropped connections).
+"""
+
+import contextlib
+import random
+
+import httpx
+import pytest
+
+import load_sra_accessions as sra
+
+HEADER = ("\t".join(field.name for field in sra.SCHEMA) + "\n").encode()
+
+
+def make_file(rows, max_row_len, trailing_newline=True, seed=0):
+    """Build a fake SRA_Accessions.tab with `rows` rows of random length."""
+
+    rng = random.Random(seed)
+    lines = [b"SRR%d\t%s" % (i, b"x" * rng.randint(0, max_row_len)) for i in range(rows)]
+    body = b"\n".join(lines) + (b"\n" if trailing_newline else b"")
+    return HEADER + body
+
+
+class FakeResponse:
+    """Streamed reply that optionally stalls after `drop_at` bytes."""
+
+    def __init__(self, body, status_code, headers, drop_at=None):
+        self.body = body
+        self.status_code = status_code
+        self.headers = headers
+        self.drop_at = drop_at
+
+    def raise_for_status(self):
+        pass
+
+    def iter_raw(self, chunk_size):
+        for i in range(0, len(self.body), chunk_size):
+            if self.drop_at is not None and i >= self.drop_at:
+                raise httpx.ReadTimeout("stalled")
+            yield self.body[i:i + chunk_size]
+
+
+class FakeNCBI:
+    """Serves `data` with Range, If-Range and ETag handling like an HTTP server.
+
+    Args:
+        data: File contents
+        ranges: Honour Range requests (otherwise always reply 200)
+        etag: ETag to send, or None to send no validator
+        segment_reply: Optional callable (start, headers) -> FakeResponse that
+            overrides the reply to every range request after the probe
+        replaced_by: Optional (data, etag) served to every request after the
+            probe, as if NCBI regenerated the file in between
+    """
+
+    def __init__(self, data, ranges=True, etag='"v1"', segment_reply=None, replaced_by=None):
+        self.data = data
+        self.ranges = ranges
+        self.etag = etag
+        self.segment_reply = segment_reply
+        self.replaced_by = replaced_by
+        self.probed = False
+
+    def range_reply(self, start, end):
+        headers = {"content-range": f"bytes {start}-{end}/{len(self.data)}"}
+        if self.etag:
+            headers["etag"] = self.etag
+        return FakeResponse(self.data[start:end + 1], 206, headers)
+
+    @contextlib.contextmanager
+    def stream(self, method, url, headers):
+        if self.probed and self.replaced_by is not None:
+            self.data, self.etag = self.replaced_by
+        self.probed = True
+
+        if "Range" not in headers or not self.ranges:
+            yield FakeResponse(self.data, 200, {})
+            return
+
+        start, end = (int(n) for n in headers["Range"].split("=")[1].split("-"))
+        if start > 0 and self.segment_reply is not None:
+            yield self.segment_reply(start, headers) or self.range_reply(start, end)
+        elif "If-Range" in headers and headers["If-Range"] != self.etag:
+            yield FakeResponse(self.data, 200, {})
+        else:
+            yield self.range_reply(start, end)
+
+
+class FakeBlob:
+    def __init__(self, store, name):
+        self.store = store
+        self.name = name
+
+    def upload_from_string(self, data, content_type=None):
+        # The real client rejects bytearray
+        assert type(data) is bytes
+        self.store[self.name] = data
+
+
+class FakeBucket:
+    def __init__(self, store):
+        self.store = store
+
+    def blob(self, name):
+        return FakeBlob(self.store, name)
+
+    def list_blobs(self, prefix):
+        return [FakeBlob(self.store, name) for name in self.store if name.startswith(prefix)]
+
+    def delete_blobs(self, blobs):
+        for blob in blobs:
+            del self.store[blob.name]
+
+
+class FakeStorageClient:
+    def __init__(self):
+        self.store = {}
+
+    def bucket(self, name):
+        return FakeBucket(self.store)
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    client = FakeStorageClient()
+    monkeypatch.setattr(sra, "get_storage_client", lambda: client)
+    monkeypatch.setattr(sra.time, "sleep", lambda seconds: None)
+    return client.store
+
+
+def run_split(monkeypatch, server, workers, http_chunk, part_size):
+    monkeypatch.setattr(sra, "get_http_client", lambda: server)
+    monkeypatch.setattr(sra, "DOWNLOAD_WORKERS", workers)
+    monkeypatch.setattr(sra, "HTTP_CHUNK_SIZE", http_chunk)
+    monkeypatch.setattr(sra, "PART_SIZE", part_size)
+    sra.stream_split_to_gcs()
+
+
+def assert_rows_match(store, data):
+    """Every part is header + whole rows, and the parts hold each row once."""
+
+    parts = [store[name] for name in sorted(store)]
+    assert parts
+    rows = []
+    for part in parts:
+        assert part.startswith(HEADER)
+        assert part.endswith(b"\n")
+        rows.extend(part[len(HEADER):].split(b"\n")[:-1])
+    expected = data[len(HEADER):].rstrip(b"\n").split(b"\n")
+    assert sorted(rows) == sorted(expected)
+
+
+@pytest.mark.parametrize("workers", [1, 3, 8, 23, 60])
+@pytest.mark.parametrize("http_chunk", [1, 17, 4096])
+@pytest.mark.parametrize("trailing_newline", [True, False])
+def test_ranges_hold_every_row_once(monkeypatch, storage, workers, http_chunk, trailing_newline):
+    data = make_file(300, 40, trailing_newline)
+    run_split(monkeypatch, FakeNCBI(data), workers, http_chunk, part_size=500)
+    assert_rows_match(storage, data)
+
+
+@pytest.mark.parametrize("workers", [8, 60])
+def test_rows_longer_than_a_segment(monkeypatch, storage, workers):
+    # Most segments start and end inside one row and must own nothing
+    data = make_file(20, 2000)
+    run_split(monkeypatch, FakeNCBI(data), workers, http_chunk=64, part_size=3000)
+    assert_rows_match(storage, data)
+
+
+@pytest.mark.parametrize("server_kwargs", [{"ranges": False}, {"etag": None}])
+def test_single_stream_fallback(monkeypatch, storage, server_kwargs):
+    data = make_file(300, 40, trailing_newline=False)
+    run_split(monkeypatch, FakeNCBI(data, **server_kwargs), 8, http_chunk=17, part_size=500)
+    assert_rows_match(storage, data)
+
+
+def test_dropped_connections_resume(monkeypatch, storage):
+    data = make_file(2000, 40)
+    rng = random.Random(1)
+    resumes = set()
+
+    def flaky(start, headers):
+        # Each range drops once partway through, then resumes from the byte
+        # after the last chunk delivered (drop_at is a multiple of the chunk)
+        if start not in resumes:
+            end = int(headers["Range"].split("-")[1])
+            reply = server.range_reply(start, end)
+            reply.drop_at = rng.randrange(0, 4096, 64)
+            resumes.add(start + reply.drop_at)
+            return reply
+
+    server = FakeNCBI(data, segment_reply=flaky)
+    run_split(monkeypatch, server, 8, http_chunk=64, part_size=2000)
+    assert_rows_match(storage, data)
+
+
+def ignored_range(start, headers):
+    return FakeResponse(b"", 200, {})
+
+
+def empty_range(start, headers):
+    total = int(headers["Range"].split("-")[1]) + 1
+    return FakeResponse(b"", 206, {"content-range": f"bytes {start}-{total - 1}/{total}"})
+
+
+def wrong_total(start, headers):
+    total = int(headers["Range"].split("-")[1]) + 1
+    return FakeResponse(b"", 206, {"content-range": f"bytes {start}-{total - 1}/{total + 1}"})
+
+
+def short_range(start, headers):
+    total = int(headers["Range"].split("-")[1]) + 1
+    return FakeResponse(b"x\n", 206, {"content-range": f"bytes {start}-{total - 1}/{total}"})
+
+
+def stalled_range(start, headers):
+    total = int(headers["Range"].split("-")[1]) + 1
+    return FakeResponse(
+        b"x" * 256, 206, {"content-range": f"bytes {start}-{total - 1}/{total}"}, drop_at=0
+    )
+
+
+@pytest.mark.parametrize(
+    "segment_reply",
+    [ignored_range, empty_range, wrong_total, short_range, stalled_range],
+)
+def test_bad_range_replies_fail(monkeypatch, storage, segment_reply):
+    data = make_file(300, 40)
+    server = FakeNCBI(data, segment_reply=segment_reply)
+    with pytest.raises(SystemExit):
+        run_split(monkeypatch, server, 4, http_chunk=64, part_size=500)
+
+
+def test_replaced_file_fails(monkeypatch, storage):
+    data = make_file(300, 40)
+    # Regenerated after the probe: same size, different rows, new ETag. Only
+    # If-Range can tell the ranges apart from the probed version.
+    newer = make_file(300, 40, seed=1)[:len(data)].ljust(len(data), b"\n")
+    server = FakeNCBI(data, replaced_by=(newer, '"v2"'))
+    with pytest.raises(SystemExit):
+        run_split(monkeypatch, server, 4, http_chunk=64, part_size=500)